@@ -268,7 +268,8 @@ async def fetch_eoa_transactions(
     """Fetch recent transactions for an EVM address.
 
     Supports Ethereum, Base, Arbitrum, and Polygon via Etherscan V2 API.
-    Returns same shape as safe_reader.fetch_safe_transactions().
+    Returns same shape and newest-first order as
+    safe_reader.fetch_safe_transactions().
     """
     if not ETHERSCAN_KEY:
         return None
@@ -41,7 +41,7 @@ from .database import (
 )
 from .scheduler import scheduler_loop
 from .notifications import notify_audit_result
-from .webhooks import build_webhook_payload, send_webhook
+from .webhooks import build_webhook_payload, send_webhook, close_webhook_client
 
 import yaml
 
@@ -125,6 +125,7 @@ async def lifespan(app: FastAPI):
         await scheduler_task
     except asyncio.CancelledError:
         pass
+    await close_webhook_client()
     await close_db()
 
 
@@ -36,26 +36,35 @@ async def _fetch_eth_price(client: httpx.AsyncClient) -> float:
         return 0.0
 
 
-async def fetch_safe_balances(safe_address: str) -> dict | None:
+def _new_client() -> httpx.AsyncClient:
+    return httpx.AsyncClient(timeout=30, follow_redirects=True)
+
+
+async def fetch_safe_balances(safe_address: str, *, client: httpx.AsyncClient | None = None) -> dict | None:
     """Fetch token balances and USD values for a Gnosis Safe address.
 
     Uses Safe Transaction Service for balances, CoinGecko for ETH price,
     and $1.00/unit for known stablecoins. Other tokens get $0 estimate.
+    Pass `client` to reuse its connection pool; otherwise a client is opened
+    and closed for this call.
     """
-    async with httpx.AsyncClient(timeout=30, follow_redirects=True) as client:
-        try:
-            resp = await client.get(
-                f"{SAFE_API}/safes/{safe_address}/balances/",
-                params={"trusted": "true", "exclude_spam": "true"},
-            )
-            resp.raise_for_status()
-        except httpx.HTTPError:
-            return None
+    if client is None:
+        async with _new_client() as client:
+            return await fetch_safe_balances(safe_address, client=client)
+
+    try:
+        resp = await client.get(
+            f"{SAFE_API}/safes/{safe_address}/balances/",
+            params={"trusted": "true", "exclude_spam": "true"},
+        )
+        resp.raise_for_status()
+    except httpx.HTTPError:
+        return None
 
-        raw_balances = resp.json()
+    raw_balances = resp.json()
 
-        # Fetch ETH price for USD estimation
-        eth_price = await _fetch_eth_price(client)
+    # Fetch ETH price for USD estimation
+    eth_price = await _fetch_eth_price(client)
 
     tokens = []
     total_usd = 0.0
@@ -111,23 +120,30 @@ async def fetch_safe_balances(safe_address: str) -> dict | None:
     }
 
 
-async def fetch_safe_transactions(safe_address: str, limit: int = 20) -> list[dict] | None:
+async def fetch_safe_transactions(
+    safe_address: str, limit: int = 20, *, client: httpx.AsyncClient | None = None
+) -> list[dict] | None:
     """Fetch recent executed multisig transactions for a Gnosis Safe.
 
     Returns a list of transaction dicts with execution_date, value, method,
-    token details, and tx_hash. Only includes executed transactions.
+    token details, and tx_hash. Only includes executed transactions, ordered
+    newest first (the API is queried with ordering=-executionDate).
+    `client` works as in fetch_safe_balances().
     """
-    async with httpx.AsyncClient(timeout=30, follow_redirects=True) as client:
-        try:
-            resp = await client.get(
-                f"{SAFE_API}/safes/{safe_address}/multisig-transactions/",
-                params={"limit": limit, "executed": "true", "ordering": "-executionDate"},
-            )
-            resp.raise_for_status()
-        except httpx.HTTPError:
-            return None
-
-        data = resp.json()
+    if client is None:
+        async with _new_client() as client:
+            return await fetch_safe_transactions(safe_address, limit, client=client)
+
+    try:
+        resp = await client.get(
+            f"{SAFE_API}/safes/{safe_address}/multisig-transactions/",
+            params={"limit": limit, "executed": "true", "ordering": "-executionDate"},
+        )
+        resp.raise_for_status()
+    except httpx.HTTPError:
+        return None
+
+    data = resp.json()
 
     transactions = []
     for tx in data.get("results", []):
@@ -187,7 +187,8 @@ async def fetch_solana_transactions(
 ) -> list[dict] | None:
     """Fetch recent transactions for a Solana address.
 
-    Returns list matching safe_reader.fetch_safe_transactions() shape.
+    Returns list matching safe_reader.fetch_safe_transactions() shape,
+    newest first (the order getSignaturesForAddress returns).
     Uses getSignaturesForAddress only (avoids per-tx RPC calls to stay
     within public RPC rate limits).
     """
@@ -2,7 +2,11 @@
 
 from __future__ import annotations
 
+import sys
 from datetime import datetime, timezone
+from functools import cached_property
+from types import MappingProxyType
+from typing import Callable, Iterable, Mapping, NamedTuple
 
 from .safe_reader import build_price_map
 
@@ -74,27 +78,58 @@ RULE_RECOMMENDATIONS = {
 }
 
 
-DEFAULT_RULES = [
-    {"type": "allocation_cap", "params": {"max_percent": 30}, "severity": "breach"},
-    {"type": "stablecoin_floor", "params": {"min_percent": 20}, "severity": "breach"},
-    {"type": "single_asset_cap", "params": {"max_usd": 500000}, "severity": "warning"},
-    {"type": "max_tx_size", "params": {"max_usd": 100000}, "severity": "warning"},
-    {"type": "inactivity_alert", "params": {"threshold_hours": 168}, "severity": "warning"},
-    {"type": "min_diversification", "params": {"min_tokens": 3}, "severity": "warning"},
-    {"type": "volatile_exposure", "params": {"max_percent": 80}, "severity": "breach"},
-    {"type": "min_treasury_value", "params": {"min_usd": 100000}, "severity": "warning"},
-    {"type": "large_tx_ratio", "params": {"max_percent": 15}, "severity": "warning"},
-    {"type": "concentration_hhi", "params": {"max_hhi": 3000}, "severity": "warning"},
-]
+# Result skeletons with the static metadata filled in; checks copy one and
+# set only the fields that depend on the portfolio.
+RULE_PROTOTYPE = {
+    rule: {
+        "rule": rule,
+        "passed": True,
+        "current_value": "",
+        "threshold": "",
+        "severity": "",
+        "detail": "",
+        "name": meta["name"],
+        "description": meta["description"],
+        "rationale": meta["rationale"],
+    }
+    for rule, meta in RULE_METADATA.items()
+}
+
+# Results for rules that cannot be evaluated: an empty portfolio, or no
+# transaction history to inspect. Checks return these before touching any data.
+EMPTY_PORTFOLIO_RESULT = {
+    rule: {**RULE_PROTOTYPE[rule], "current_value": value, "detail": "Portfolio is empty"}
+    for rule, value in (
+        ("allocation_cap", "0%"),
+        ("stablecoin_floor", "0%"),
+        ("volatile_exposure", "0%"),
+        ("concentration_hhi", "0"),
+    )
+}
+
+NO_TX_DATA_RESULT = {
+    rule: {**RULE_PROTOTYPE[rule], "current_value": "N/A", "detail": "No transaction data available — skipped"}
+    for rule in ("max_tx_size", "inactivity_alert", "large_tx_ratio")
+}
 
 
-def _enrich_result(result: dict) -> dict:
-    """Add metadata (name, description, rationale) to a rule result."""
-    meta = RULE_METADATA.get(result["rule"], {})
-    result["name"] = meta.get("name", result["rule"])
-    result["description"] = meta.get("description", "")
-    result["rationale"] = meta.get("rationale", "")
-    return result
+# Shared by every caller that falls back to the defaults, so frozen against
+# accidental mutation: a tuple of read-only rule mappings.
+DEFAULT_RULES = tuple(
+    MappingProxyType({**rule, "params": MappingProxyType(rule["params"])})
+    for rule in (
+        {"type": "allocation_cap", "params": {"max_percent": 30}, "severity": "breach"},
+        {"type": "stablecoin_floor", "params": {"min_percent": 20}, "severity": "breach"},
+        {"type": "single_asset_cap", "params": {"max_usd": 500000}, "severity": "warning"},
+        {"type": "max_tx_size", "params": {"max_usd": 100000}, "severity": "warning"},
+        {"type": "inactivity_alert", "params": {"threshold_hours": 168}, "severity": "warning"},
+        {"type": "min_diversification", "params": {"min_tokens": 3}, "severity": "warning"},
+        {"type": "volatile_exposure", "params": {"max_percent": 80}, "severity": "breach"},
+        {"type": "min_treasury_value", "params": {"min_usd": 100000}, "severity": "warning"},
+        {"type": "large_tx_ratio", "params": {"max_percent": 15}, "severity": "warning"},
+        {"type": "concentration_hhi", "params": {"max_hhi": 3000}, "severity": "warning"},
+    )
+)
 
 
 def _generate_recommendation(result: dict) -> dict:
@@ -106,43 +141,101 @@ def _generate_recommendation(result: dict) -> dict:
     }
 
 
-def validate_policy(balances: dict, rules: list[dict], transactions: list[dict] | None = None) -> dict:
+class _TokenColumns(NamedTuple):
+    """Token fields as parallel lists in balance order, plus same-pass aggregates."""
+
+    symbols: list[str]
+    usd: list[float]
+    balance: list[float]
+    is_stable: list[bool]
+    stable_usd: float
+    max_usd: float
+    meaningful_count: int
+
+
+def _scan_tokens(tokens: list[dict]) -> _TokenColumns:
+    """Walk the token list once, splitting it into columns and summing as we go."""
+    symbols, usd_values, balances, is_stable = [], [], [], []
+    stable_usd = 0
+    max_usd = float("-inf")
+    meaningful_count = 0
+
+    for t in tokens:
+        usd = t["usd_value"]
+        bal = t["balance"]
+        stable = t["is_stablecoin"]
+        symbols.append(t["symbol"])
+        usd_values.append(usd)
+        balances.append(bal)
+        is_stable.append(stable)
+        if stable:
+            stable_usd += usd
+        if usd > max_usd:
+            max_usd = usd
+        # Count tokens with meaningful balance (> $100 to filter dust)
+        if usd > 100 or bal > 0.01:
+            meaningful_count += 1
+
+    return _TokenColumns(symbols, usd_values, balances, is_stable, stable_usd, max_usd, meaningful_count)
+
+
+class _PolicyContext:
+    """Portfolio and transaction data shared by every rule check in one validation."""
+
+    def __init__(self, balances: dict, transactions: list[dict] | None, now: datetime):
+        self.balances = balances
+        self.transactions = transactions
+        self.total = balances["total_usd"]
+        # One clock reading per validation keeps time-based rules consistent
+        self.now = now
+        self.now_ts = self.now.timestamp()
+
+    @cached_property
+    def columns(self) -> _TokenColumns:
+        return _scan_tokens(self.balances["tokens"])
+
+    @cached_property
+    def tx_usd(self) -> list[float]:
+        # Per-tx USD estimates are shared by max_tx_size and large_tx_ratio.
+        # Only built once a check has confirmed there are transactions to score.
+        return _estimate_tx_values(self.transactions, self.balances)
+
+    @cached_property
+    def max_tx_usd(self) -> float:
+        # Lets both tx rules settle the all-clear case with one comparison
+        return max(self.tx_usd)
+
+    @cached_property
+    def latest_execution_date(self) -> datetime | None:
+        return _latest_execution_date(self.transactions)
+
+
+def validate_policy(
+    balances: dict,
+    rules: Iterable[Mapping],
+    transactions: list[dict] | None = None,
+    now: datetime | None = None,
+) -> dict:
     """Compare live Safe state against policy rules.
 
-    Returns a compliance report with pass/fail per rule.
+    Returns a compliance report with pass/fail per rule. Time-based rules are
+    evaluated against `now` (default: the current UTC time).
     """
+    ctx = _PolicyContext(balances, transactions, now or datetime.now(timezone.utc))
     results = []
 
     for rule in rules:
-        rule_type = rule["type"]
-        params = rule.get("params", {})
-        severity = rule.get("severity", "warning")
-
-        if rule_type == "allocation_cap":
-            results.extend(_check_allocation_cap(balances, params, severity))
-        elif rule_type == "stablecoin_floor":
-            results.append(_check_stablecoin_floor(balances, params, severity))
-        elif rule_type == "single_asset_cap":
-            results.append(_check_single_asset_cap(balances, params, severity))
-        elif rule_type == "max_tx_size":
-            results.append(_check_max_tx_size(transactions, balances, params, severity))
-        elif rule_type == "inactivity_alert":
-            results.append(_check_inactivity_alert(transactions, params, severity))
-        elif rule_type == "min_diversification":
-            results.append(_check_min_diversification(balances, params, severity))
-        elif rule_type == "volatile_exposure":
-            results.append(_check_volatile_exposure(balances, params, severity))
-        elif rule_type == "min_treasury_value":
-            results.append(_check_min_treasury_value(balances, params, severity))
-        elif rule_type == "large_tx_ratio":
-            results.append(_check_large_tx_ratio(transactions, balances, params, severity))
-        elif rule_type == "concentration_hhi":
-            results.append(_check_concentration_hhi(balances, params, severity))
-
-    results = [_enrich_result(r) for r in results]
-    recommendations = [_generate_recommendation(r) for r in results if not r["passed"]]
-
-    passed_count = sum(1 for r in results if r["passed"])
+        check = RULE_DISPATCH.get(rule["type"])
+        if check:
+            results.extend(check(ctx, rule.get("params", {}), rule.get("severity", "warning")))
+
+    passed_count = 0
+    recommendations = []
+    for r in results:
+        if r["passed"]:
+            passed_count += 1
+        else:
+            recommendations.append(_generate_recommendation(r))
     total_count = len(results)
 
     return {
@@ -157,374 +250,353 @@ def validate_policy(balances: dict, rules: list[dict], transactions: list[dict]
     }
 
 
-def _check_allocation_cap(balances: dict, params: dict, severity: str) -> list[dict]:
+def _check_allocation_cap(ctx: _PolicyContext, params: dict, severity: str) -> list[dict]:
     """Check that no single token exceeds max_percent of total portfolio."""
     max_pct = params.get("max_percent", 30)
-    total = balances["total_usd"]
-    results = []
+    cap_str = f"{max_pct}%"
+    total = ctx.total
 
     if total == 0:
+        return [{**EMPTY_PORTFOLIO_RESULT["allocation_cap"], "threshold": cap_str, "severity": severity}]
+
+    # Scan first; result dicts and strings are only built for breaching tokens.
+    # The largest holding settles the common all-clear case without a scan.
+    cols = ctx.columns
+    if total > 0 and (cols.max_usd / total) * 100 <= max_pct:
+        breaches = []
+    else:
+        breaches = [i for i, usd in enumerate(cols.usd) if (usd / total) * 100 > max_pct]
+
+    if not breaches:
         return [{
-            "rule": "allocation_cap",
+            **RULE_PROTOTYPE["allocation_cap"],
             "passed": True,
-            "current_value": "0%",
-            "threshold": f"{max_pct}%",
+            "current_value": "all within cap",
+            "threshold": cap_str,
             "severity": severity,
-            "detail": "Portfolio is empty",
+            "detail": "No single token exceeds allocation cap",
         }]
 
-    for token in balances["tokens"]:
-        pct = (token["usd_value"] / total) * 100
-        if pct > max_pct:
-            results.append({
-                "rule": "allocation_cap",
-                "passed": False,
-                "current_value": f"{pct:.1f}%",
-                "threshold": f"{max_pct}%",
-                "severity": severity,
-                "detail": f"{token['symbol']} is {pct:.1f}% of portfolio (${token['usd_value']:,.0f}) — exceeds {max_pct}% cap",
-            })
-
-    if not results:
+    results = []
+    for i in breaches:
+        usd = cols.usd[i]
+        pct = (usd / total) * 100
         results.append({
-            "rule": "allocation_cap",
-            "passed": True,
-            "current_value": "all within cap",
-            "threshold": f"{max_pct}%",
+            **RULE_PROTOTYPE["allocation_cap"],
+            "passed": False,
+            "current_value": f"{pct:.1f}%",
+            "threshold": cap_str,
             "severity": severity,
-            "detail": "No single token exceeds allocation cap",
+            "detail": f"{cols.symbols[i]} is {pct:.1f}% of portfolio (${usd:,.0f}) — exceeds {cap_str} cap",
         })
 
     return results
 
 
-def _check_stablecoin_floor(balances: dict, params: dict, severity: str) -> dict:
+def _check_stablecoin_floor(ctx: _PolicyContext, params: dict, severity: str) -> list[dict]:
     """Check that stablecoins are at least min_percent of portfolio."""
     min_pct = params.get("min_percent", 20)
-    total = balances["total_usd"]
+    min_str = f"{min_pct}%"
+    total = ctx.total
 
     if total == 0:
-        return {
-            "rule": "stablecoin_floor",
-            "passed": True,
-            "current_value": "0%",
-            "threshold": f"{min_pct}%",
-            "severity": severity,
-            "detail": "Portfolio is empty",
-        }
+        return [{**EMPTY_PORTFOLIO_RESULT["stablecoin_floor"], "threshold": min_str, "severity": severity}]
 
-    stable_usd = sum(t["usd_value"] for t in balances["tokens"] if t["is_stablecoin"])
+    stable_usd = ctx.columns.stable_usd
     stable_pct = (stable_usd / total) * 100
 
-    return {
-        "rule": "stablecoin_floor",
+    return [{
+        **RULE_PROTOTYPE["stablecoin_floor"],
         "passed": stable_pct >= min_pct,
         "current_value": f"{stable_pct:.1f}%",
-        "threshold": f"{min_pct}%",
+        "threshold": min_str,
         "severity": severity,
         "detail": f"Stablecoins: ${stable_usd:,.0f} ({stable_pct:.1f}% of portfolio)"
-        + ("" if stable_pct >= min_pct else f" — below {min_pct}% floor"),
-    }
+        + ("" if stable_pct >= min_pct else f" — below {min_str} floor"),
+    }]
 
 
-def _check_single_asset_cap(balances: dict, params: dict, severity: str) -> dict:
+def _check_single_asset_cap(ctx: _PolicyContext, params: dict, severity: str) -> list[dict]:
     """Check that no single asset exceeds max_usd absolute value."""
     max_usd = params.get("max_usd", 500000)
+    cap_str = f"${max_usd:,.0f}"
 
-    breaches = [t for t in balances["tokens"] if t["usd_value"] > max_usd]
+    cols = ctx.columns
+    if cols.max_usd <= max_usd:
+        breaches = []
+    else:
+        breaches = [(symbol, usd) for symbol, usd in zip(cols.symbols, cols.usd) if usd > max_usd]
 
     if breaches:
-        detail = ", ".join(f"{t['symbol']}: ${t['usd_value']:,.0f}" for t in breaches)
-        return {
-            "rule": "single_asset_cap",
+        detail = ", ".join(f"{symbol}: ${usd:,.0f}" for symbol, usd in breaches)
+        return [{
+            **RULE_PROTOTYPE["single_asset_cap"],
             "passed": False,
             "current_value": f"{len(breaches)} asset(s) over cap",
-            "threshold": f"${max_usd:,.0f}",
+            "threshold": cap_str,
             "severity": severity,
             "detail": f"Over cap: {detail}",
-        }
+        }]
 
-    return {
-        "rule": "single_asset_cap",
+    return [{
+        **RULE_PROTOTYPE["single_asset_cap"],
         "passed": True,
         "current_value": "all within cap",
-        "threshold": f"${max_usd:,.0f}",
+        "threshold": cap_str,
         "severity": severity,
         "detail": "No single asset exceeds absolute USD cap",
-    }
+    }]
 
 
-def _check_max_tx_size(transactions: list[dict] | None, balances: dict, params: dict, severity: str) -> dict:
+def _check_max_tx_size(ctx: _PolicyContext, params: dict, severity: str) -> list[dict]:
     """Check that no recent transaction exceeds max_usd threshold."""
     max_usd = params.get("max_usd", 100000)
+    cap_str = f"${max_usd:,.0f}"
 
-    if transactions is None:
-        return {
-            "rule": "max_tx_size",
-            "passed": True,
-            "current_value": "N/A",
-            "threshold": f"${max_usd:,.0f}",
-            "severity": severity,
-            "detail": "No transaction data available — skipped",
-        }
+    if ctx.transactions is None:
+        return [{**NO_TX_DATA_RESULT["max_tx_size"], "threshold": cap_str, "severity": severity}]
 
-    if not transactions:
-        return {
-            "rule": "max_tx_size",
+    if not ctx.transactions:
+        return [{
+            **RULE_PROTOTYPE["max_tx_size"],
             "passed": True,
             "current_value": "no recent transactions",
-            "threshold": f"${max_usd:,.0f}",
+            "threshold": cap_str,
             "severity": severity,
             "detail": "No executed transactions found",
-        }
-
-    prices = build_price_map(balances)
-
-    breaches = []
-    for tx in transactions:
-        estimated_usd = _estimate_tx_usd(tx, balances, prices)
-        if estimated_usd > max_usd:
-            breaches.append({
-                "tx_hash": tx["tx_hash"],
-                "estimated_usd": estimated_usd,
-                "date": tx["execution_date"],
-            })
+        }]
 
-    if breaches:
-        worst = max(breaches, key=lambda b: b["estimated_usd"])
-        return {
-            "rule": "max_tx_size",
+    if ctx.max_tx_usd > max_usd:
+        breaches = [i for i, usd in enumerate(ctx.tx_usd) if usd > max_usd]
+        # Only the worst breach is reported, so format just that one
+        worst = max(breaches, key=ctx.tx_usd.__getitem__)
+        worst_usd = ctx.tx_usd[worst]
+        return [{
+            **RULE_PROTOTYPE["max_tx_size"],
             "passed": False,
-            "current_value": f"${worst['estimated_usd']:,.0f}",
-            "threshold": f"${max_usd:,.0f}",
+            "current_value": f"${worst_usd:,.0f}",
+            "threshold": cap_str,
             "severity": severity,
-            "detail": f"{len(breaches)} transaction(s) exceed ${max_usd:,.0f} cap. "
-                      f"Largest: ${worst['estimated_usd']:,.0f} on {worst['date']}",
-        }
+            "detail": f"{len(breaches)} transaction(s) exceed {cap_str} cap. "
+                      f"Largest: ${worst_usd:,.0f} on {ctx.transactions[worst]['execution_date']}",
+        }]
 
-    return {
-        "rule": "max_tx_size",
+    return [{
+        **RULE_PROTOTYPE["max_tx_size"],
         "passed": True,
-        "current_value": f"{len(transactions)} recent txs checked",
-        "threshold": f"${max_usd:,.0f}",
+        "current_value": f"{len(ctx.transactions)} recent txs checked",
+        "threshold": cap_str,
         "severity": severity,
-        "detail": f"All {len(transactions)} recent transactions within ${max_usd:,.0f} cap",
-    }
+        "detail": f"All {len(ctx.transactions)} recent transactions within {cap_str} cap",
+    }]
 
 
-def _check_inactivity_alert(transactions: list[dict] | None, params: dict, severity: str) -> dict:
+def _check_inactivity_alert(ctx: _PolicyContext, params: dict, severity: str) -> list[dict]:
     """Check that the Safe has had activity within threshold_hours."""
     threshold_hours = params.get("threshold_hours", 168)
+    threshold_str = f"{threshold_hours}h"
 
-    if transactions is None:
-        return {
-            "rule": "inactivity_alert",
-            "passed": True,
-            "current_value": "N/A",
-            "threshold": f"{threshold_hours}h",
-            "severity": severity,
-            "detail": "No transaction data available — skipped",
-        }
+    if ctx.transactions is None:
+        return [{**NO_TX_DATA_RESULT["inactivity_alert"], "threshold": threshold_str, "severity": severity}]
 
-    if not transactions:
-        return {
-            "rule": "inactivity_alert",
+    if not ctx.transactions:
+        return [{
+            **RULE_PROTOTYPE["inactivity_alert"],
             "passed": False,
             "current_value": "no transactions found",
-            "threshold": f"{threshold_hours}h",
+            "threshold": threshold_str,
             "severity": severity,
             "detail": "No executed transactions found — Safe may be inactive or new",
-        }
+        }]
 
-    # Find most recent execution date
-    latest_date = None
-    for tx in transactions:
-        date_str = tx.get("execution_date")
-        if date_str:
-            try:
-                # Try ISO format first (Safe API / Solana)
-                dt = datetime.fromisoformat(date_str.replace("Z", "+00:00"))
-            except ValueError:
-                try:
-                    # Fallback: Unix timestamp string (Etherscan)
-                    dt = datetime.fromtimestamp(int(date_str), tz=timezone.utc)
-                except (ValueError, TypeError, OSError):
-                    continue
-            if latest_date is None or dt > latest_date:
-                latest_date = dt
+    latest_date = ctx.latest_execution_date
 
     if latest_date is None:
-        return {
-            "rule": "inactivity_alert",
+        return [{
+            **RULE_PROTOTYPE["inactivity_alert"],
             "passed": False,
             "current_value": "unknown",
-            "threshold": f"{threshold_hours}h",
+            "threshold": threshold_str,
             "severity": severity,
             "detail": "Could not determine last transaction date",
-        }
+        }]
 
-    now = datetime.now(timezone.utc)
-    hours_since = (now - latest_date).total_seconds() / 3600
+    hours_since = (ctx.now_ts - latest_date.timestamp()) / 3600
 
-    return {
-        "rule": "inactivity_alert",
+    return [{
+        **RULE_PROTOTYPE["inactivity_alert"],
         "passed": hours_since <= threshold_hours,
         "current_value": f"{hours_since:.0f}h ago",
-        "threshold": f"{threshold_hours}h",
+        "threshold": threshold_str,
         "severity": severity,
         "detail": f"Last transaction: {latest_date.strftime('%Y-%m-%d %H:%M UTC')} ({hours_since:.0f}h ago)"
-        + ("" if hours_since <= threshold_hours else f" — exceeds {threshold_hours}h threshold"),
-    }
+        + ("" if hours_since <= threshold_hours else f" — exceeds {threshold_str} threshold"),
+    }]
+
+
+_UTC_SUFFIXES = ("Z", "+00:00")
+
+# datetime.fromisoformat parses a trailing "Z" natively from Python 3.11
+_ISO_ACCEPTS_Z = sys.version_info >= (3, 11)
+
+
+def _parse_execution_date(date_str: str) -> datetime | None:
+    """Parse a transaction execution date, or None if it is unparseable."""
+    try:
+        # Try ISO format first (Safe API / Solana)
+        return datetime.fromisoformat(date_str if _ISO_ACCEPTS_Z else date_str.replace("Z", "+00:00"))
+    except ValueError:
+        try:
+            # Fallback: Unix timestamp string (Etherscan)
+            return datetime.fromtimestamp(int(date_str), tz=timezone.utc)
+        except (ValueError, TypeError, OSError):
+            return None
+
+
+def _latest_execution_date(transactions: list[dict]) -> datetime | None:
+    """Find the most recent execution date across transactions.
+
+    UTC ISO-8601 strings sort lexically in chronological order, so when every
+    date carries a UTC suffix only the largest string is parsed. Otherwise
+    (other offsets, Unix timestamps, garbage) every date is parsed.
+    """
+    dates = [tx["execution_date"] for tx in transactions if tx.get("execution_date")]
+    if not dates:
+        return None
 
+    if all(d.endswith(_UTC_SUFFIXES) for d in dates):
+        latest = _parse_execution_date(max(dates))
+        if latest is not None:
+            return latest
 
-def _check_min_diversification(balances: dict, params: dict, severity: str) -> dict:
+    parsed = [dt for dt in map(_parse_execution_date, dates) if dt is not None]
+    return max(parsed, default=None)
+
+
+def _check_min_diversification(ctx: _PolicyContext, params: dict, severity: str) -> list[dict]:
     """Check that the portfolio holds at least min_tokens distinct tokens."""
     min_tokens = params.get("min_tokens", 3)
-    # Count tokens with meaningful balance (> $100 to filter dust)
-    meaningful = [t for t in balances["tokens"] if t["usd_value"] > 100 or t["balance"] > 0.01]
-    count = len(meaningful)
+    count = ctx.columns.meaningful_count
 
-    return {
-        "rule": "min_diversification",
+    return [{
+        **RULE_PROTOTYPE["min_diversification"],
         "passed": count >= min_tokens,
         "current_value": f"{count} tokens",
         "threshold": f"{min_tokens} min",
         "severity": severity,
         "detail": f"Portfolio holds {count} distinct token(s)"
         + ("" if count >= min_tokens else f" — below {min_tokens} minimum for diversification"),
-    }
+    }]
 
 
-def _check_volatile_exposure(balances: dict, params: dict, severity: str) -> dict:
+def _check_volatile_exposure(ctx: _PolicyContext, params: dict, severity: str) -> list[dict]:
     """Check that non-stablecoin assets don't exceed max_percent of portfolio."""
     max_pct = params.get("max_percent", 80)
-    total = balances["total_usd"]
+    cap_str = f"{max_pct}%"
+    total = ctx.total
 
     if total == 0:
-        return {
-            "rule": "volatile_exposure",
-            "passed": True,
-            "current_value": "0%",
-            "threshold": f"{max_pct}%",
-            "severity": severity,
-            "detail": "Portfolio is empty",
-        }
+        return [{**EMPTY_PORTFOLIO_RESULT["volatile_exposure"], "threshold": cap_str, "severity": severity}]
 
-    stable_usd = sum(t["usd_value"] for t in balances["tokens"] if t["is_stablecoin"])
-    volatile_usd = total - stable_usd
+    volatile_usd = total - ctx.columns.stable_usd
     volatile_pct = (volatile_usd / total) * 100
 
-    return {
-        "rule": "volatile_exposure",
+    return [{
+        **RULE_PROTOTYPE["volatile_exposure"],
         "passed": volatile_pct <= max_pct,
         "current_value": f"{volatile_pct:.1f}%",
-        "threshold": f"{max_pct}%",
+        "threshold": cap_str,
         "severity": severity,
         "detail": f"Volatile assets: ${volatile_usd:,.0f} ({volatile_pct:.1f}% of portfolio)"
-        + ("" if volatile_pct <= max_pct else f" — exceeds {max_pct}% cap"),
-    }
+        + ("" if volatile_pct <= max_pct else f" — exceeds {cap_str} cap"),
+    }]
 
 
-def _check_min_treasury_value(balances: dict, params: dict, severity: str) -> dict:
+def _check_min_treasury_value(ctx: _PolicyContext, params: dict, severity: str) -> list[dict]:
     """Check that total portfolio value meets a minimum USD threshold."""
     min_usd = params.get("min_usd", 100000)
-    total = balances["total_usd"]
+    min_str = f"${min_usd:,.0f}"
+    total = ctx.total
 
-    return {
-        "rule": "min_treasury_value",
+    return [{
+        **RULE_PROTOTYPE["min_treasury_value"],
         "passed": total >= min_usd,
         "current_value": f"${total:,.0f}",
-        "threshold": f"${min_usd:,.0f}",
+        "threshold": min_str,
         "severity": severity,
         "detail": f"Total portfolio value: ${total:,.0f}"
-        + ("" if total >= min_usd else f" — below ${min_usd:,.0f} minimum threshold"),
-    }
+        + ("" if total >= min_usd else f" — below {min_str} minimum threshold"),
+    }]
 
 
-def _check_large_tx_ratio(
-    transactions: list[dict] | None, balances: dict, params: dict, severity: str
-) -> dict:
+def _check_large_tx_ratio(ctx: _PolicyContext, params: dict, severity: str) -> list[dict]:
     """Check that no transaction exceeds max_percent of total portfolio value."""
     max_pct = params.get("max_percent", 15)
-    total = balances["total_usd"]
+    cap_str = f"{max_pct}%"
+    total = ctx.total
 
-    if transactions is None or total == 0:
-        return {
-            "rule": "large_tx_ratio",
-            "passed": True,
-            "current_value": "N/A",
-            "threshold": f"{max_pct}%",
-            "severity": severity,
-            "detail": "No transaction data available — skipped",
-        }
+    if ctx.transactions is None or total == 0:
+        return [{**NO_TX_DATA_RESULT["large_tx_ratio"], "threshold": cap_str, "severity": severity}]
 
-    if not transactions:
-        return {
-            "rule": "large_tx_ratio",
+    if not ctx.transactions:
+        return [{
+            **RULE_PROTOTYPE["large_tx_ratio"],
             "passed": True,
             "current_value": "no recent txs",
-            "threshold": f"{max_pct}%",
+            "threshold": cap_str,
             "severity": severity,
             "detail": "No executed transactions found",
-        }
-
-    prices = build_price_map(balances)
-    max_usd = total * (max_pct / 100)
+        }]
 
-    breaches = []
-    for tx in transactions:
-        estimated = _estimate_tx_usd(tx, balances, prices)
-        pct = (estimated / total) * 100 if total > 0 else 0
-        if pct > max_pct:
-            breaches.append({"pct": pct, "usd": estimated})
+    if total > 0 and (ctx.max_tx_usd / total) * 100 <= max_pct:
+        breaches = []
+    else:
+        breaches = [usd for usd in ctx.tx_usd if (usd / total) * 100 > max_pct]
 
     if breaches:
-        worst = max(breaches, key=lambda b: b["pct"])
-        return {
-            "rule": "large_tx_ratio",
+        # The largest USD value is also the largest share of the portfolio
+        worst_usd = max(breaches)
+        worst_pct = (worst_usd / total) * 100
+        return [{
+            **RULE_PROTOTYPE["large_tx_ratio"],
             "passed": False,
-            "current_value": f"{worst['pct']:.1f}%",
-            "threshold": f"{max_pct}%",
+            "current_value": f"{worst_pct:.1f}%",
+            "threshold": cap_str,
             "severity": severity,
-            "detail": f"{len(breaches)} transaction(s) exceed {max_pct}% of portfolio. "
-                      f"Largest: {worst['pct']:.1f}% (${worst['usd']:,.0f})",
-        }
+            "detail": f"{len(breaches)} transaction(s) exceed {cap_str} of portfolio. "
+                      f"Largest: {worst_pct:.1f}% (${worst_usd:,.0f})",
+        }]
 
-    return {
-        "rule": "large_tx_ratio",
+    return [{
+        **RULE_PROTOTYPE["large_tx_ratio"],
         "passed": True,
-        "current_value": f"{len(transactions)} txs checked",
-        "threshold": f"{max_pct}%",
+        "current_value": f"{len(ctx.transactions)} txs checked",
+        "threshold": cap_str,
         "severity": severity,
-        "detail": f"All {len(transactions)} recent transactions within {max_pct}% of portfolio",
-    }
+        "detail": f"All {len(ctx.transactions)} recent transactions within {cap_str} of portfolio",
+    }]
 
 
-def _check_concentration_hhi(balances: dict, params: dict, severity: str) -> dict:
+def _check_concentration_hhi(ctx: _PolicyContext, params: dict, severity: str) -> list[dict]:
     """Check portfolio concentration using the Herfindahl-Hirschman Index.
 
     HHI = sum of (market_share_i)^2 for each token, scaled 0-10000.
     <1500 = diversified, 1500-2500 = moderate, >2500 = concentrated.
     """
     max_hhi = params.get("max_hhi", 3000)
-    total = balances["total_usd"]
+    cap_str = str(max_hhi)
+    total = ctx.total
 
     if total == 0:
-        return {
-            "rule": "concentration_hhi",
-            "passed": True,
-            "current_value": "0",
-            "threshold": f"{max_hhi}",
-            "severity": severity,
-            "detail": "Portfolio is empty",
-        }
-
-    hhi = 0.0
-    for token in balances["tokens"]:
-        share = (token["usd_value"] / total) * 100  # percentage
-        hhi += share ** 2
+        return [{**EMPTY_PORTFOLIO_RESULT["concentration_hhi"], "threshold": cap_str, "severity": severity}]
 
-    hhi = round(hhi)
+    usd = ctx.columns.usd
+    if len(usd) == 1:
+        # A lone token holds the whole portfolio
+        hhi = 10000
+    else:
+        # sum((v / total * 100)^2) with the constant scale factored out
+        hhi = round(sum(v * v for v in usd) * 10000 / (total * total))
 
     if hhi < 1500:
         label = "diversified"
@@ -533,34 +605,62 @@ def _check_concentration_hhi(balances: dict, params: dict, severity: str) -> dic
     else:
         label = "concentrated"
 
-    return {
-        "rule": "concentration_hhi",
+    return [{
+        **RULE_PROTOTYPE["concentration_hhi"],
         "passed": hhi <= max_hhi,
         "current_value": f"{hhi} ({label})",
-        "threshold": f"{max_hhi}",
+        "threshold": cap_str,
         "severity": severity,
         "detail": f"HHI score: {hhi} ({label})"
-        + ("" if hhi <= max_hhi else f" — exceeds {max_hhi} threshold"),
-    }
+        + ("" if hhi <= max_hhi else f" — exceeds {cap_str} threshold"),
+    }]
 
 
-def _estimate_tx_usd(tx: dict, balances: dict, prices: dict) -> float:
-    """Estimate USD value of a transaction using current token prices."""
-    # Native ETH transfer
-    if tx["value_wei"] > 0:
-        eth_price = prices.get(None, 0)
-        return tx["value_eth"] * eth_price
-
-    # ERC-20 transfer
-    if tx["token_address"] and tx["token_value_raw"]:
-        token_addr = tx["token_address"].lower()
-        decimals = 18
-        for t in balances["tokens"]:
-            if t["address"] and t["address"].lower() == token_addr:
-                decimals = t.get("decimals", 18)
-                break
-        human_amount = tx["token_value_raw"] / (10 ** decimals)
-        usd_per_unit = prices.get(token_addr, 0)
-        return human_amount * usd_per_unit
-
-    return 0.0
+def _estimate_tx_values(transactions: list[dict], balances: dict) -> list[float]:
+    """Estimate the USD value of every transaction.
+
+    Prices and decimals are resolved once for the whole batch, so each ERC-20
+    transfer costs a single dict lookup.
+    """
+    prices = build_price_map(balances)
+    eth_price = prices.get(None, 0)
+
+    # {token_address_lower: (10 ** decimals, usd_per_unit)}
+    token_units = {}
+    for t in balances["tokens"]:
+        if t["address"]:
+            addr = t["address"].lower()
+            if addr not in token_units:
+                token_units[addr] = (10 ** t.get("decimals", 18), prices.get(addr, 0))
+
+    # Estimate each transaction in place using current token prices
+    values = []
+    for tx in transactions:
+        if not tx["value_wei"] and not tx["token_value_raw"]:
+            # Zero-value contract call — nothing moved
+            values.append(0.0)
+        elif tx["value_wei"] > 0:
+            # Native ETH transfer
+            values.append(tx["value_eth"] * eth_price)
+        elif tx["token_address"] and tx["token_value_raw"]:
+            # ERC-20 transfer
+            unit = token_units.get(tx["token_address"].lower())
+            values.append(tx["token_value_raw"] / unit[0] * unit[1] if unit else 0.0)
+        else:
+            values.append(0.0)
+
+    return values
+
+
+RULE_DISPATCH: dict[str, Callable[[_PolicyContext, dict, str], list[dict]]] = {
+    "allocation_cap": _check_allocation_cap,
+    "stablecoin_floor": _check_stablecoin_floor,
+    "single_asset_cap": _check_single_asset_cap,
+    "max_tx_size": _check_max_tx_size,
+    "inactivity_alert": _check_inactivity_alert,
+    "min_diversification": _check_min_diversification,
+    "volatile_exposure": _check_volatile_exposure,
+    "min_treasury_value": _check_min_treasury_value,
+    "large_tx_ratio": _check_large_tx_ratio,
+    "concentration_hhi": _check_concentration_hhi,
+}
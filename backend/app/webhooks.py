@@ -14,10 +14,32 @@ logger = logging.getLogger(__name__)
 
 WEBHOOK_TIMEOUT = 5.0  # seconds
 
+# Shared client so repeat deliveries reuse pooled connections and TLS sessions
+_client: httpx.AsyncClient | None = None
 
-def _sign_payload(secret: str, body: str) -> str:
-    """HMAC-SHA256 signature of the JSON body."""
-    return hmac.new(secret.encode(), body.encode(), hashlib.sha256).hexdigest()
+
+def _get_client() -> httpx.AsyncClient:
+    """Return the shared webhook client, creating it on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = httpx.AsyncClient(
+            timeout=WEBHOOK_TIMEOUT,
+            limits=httpx.Limits(max_keepalive_connections=50),
+        )
+    return _client
+
+
+async def close_webhook_client():
+    """Close the shared webhook client."""
+    global _client
+    if _client:
+        await _client.aclose()
+        _client = None
+
+
+def _sign_payload(secret: str, body: bytes) -> str:
+    """HMAC-SHA256 signature of the encoded JSON body."""
+    return hmac.digest(secret.encode(), body, hashlib.sha256).hex()
 
 
 def build_webhook_payload(
@@ -25,8 +47,12 @@ def build_webhook_payload(
     report: dict,
     audit_id: int | None,
     trigger: str,
+    now: datetime | None = None,
 ) -> dict:
-    """Build the standardised webhook payload from audit data."""
+    """Build the standardised webhook payload from audit data.
+
+    `now` stamps the payload (default: the current UTC time).
+    """
     failures = [
         {
             "rule": r.get("rule", r.get("name", "")),
@@ -51,7 +77,7 @@ def build_webhook_payload(
 
     return {
         "event": "audit.alert",
-        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "timestamp": (now or datetime.now(timezone.utc)).isoformat(),
         "wallet": {
             "id": wallet.get("id"),
             "address": wallet.get("address"),
@@ -76,15 +102,16 @@ async def send_webhook(
     payload: dict,
 ) -> bool:
     """POST the payload to the webhook URL with HMAC signature. Returns True on success."""
-    body = json.dumps(payload, default=str)
+    # Encode once: the same bytes are signed and sent. build_webhook_payload
+    # only emits JSON-native values, so no default= fallback is needed.
+    body = json.dumps(payload).encode()
 
     headers = {"Content-Type": "application/json"}
     if webhook_secret:
         headers["X-Aegis-Signature"] = _sign_payload(webhook_secret, body)
 
     try:
-        async with httpx.AsyncClient(timeout=WEBHOOK_TIMEOUT) as client:
-            resp = await client.post(webhook_url, content=body, headers=headers)
+        resp = await _get_client().post(webhook_url, content=body, headers=headers)
         if resp.status_code < 400:
             logger.info(f"Webhook delivered to {webhook_url} (HTTP {resp.status_code})")
             return True
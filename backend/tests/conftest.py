@@ -1,11 +1,17 @@
-"""Shared fixtures for AEGIS backend tests."""
+"""Shared fixtures for AEGIS backend tests.
+
+Fixtures are session-scoped: they are built once and shared, so tests must
+copy rather than mutate them.
+"""
 
 from datetime import datetime, timezone, timedelta
 
 import pytest
 
+from app.validator import validate_policy, DEFAULT_RULES
+
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def compliant_balances():
     """A well-diversified portfolio that passes all default rules."""
     return {
@@ -21,7 +27,7 @@ def compliant_balances():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def concentrated_balances():
     """A single-token portfolio that fails allocation, stablecoin, and diversification rules."""
     return {
@@ -34,7 +40,7 @@ def concentrated_balances():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def empty_balances():
     """An empty portfolio with $0."""
     return {
@@ -45,7 +51,7 @@ def empty_balances():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def small_balances():
     """A portfolio below the minimum treasury value threshold."""
     return {
@@ -59,7 +65,7 @@ def small_balances():
     }
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def recent_transactions():
     """Transactions within the last 24 hours, all small."""
     now = datetime.now(timezone.utc)
@@ -78,7 +84,7 @@ def recent_transactions():
     ]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def stale_transactions():
     """Transactions older than 7 days."""
     old = datetime.now(timezone.utc) - timedelta(hours=240)
@@ -97,7 +103,7 @@ def stale_transactions():
     ]
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def large_transactions(compliant_balances):
     """A transaction that exceeds $100K (40 ETH at $2500 = $100K)."""
     now = datetime.now(timezone.utc)
@@ -114,3 +120,21 @@ def large_transactions(compliant_balances):
             "tx_hash": "0x" + "f" * 64,
         },
     ]
+
+
+@pytest.fixture(scope="session")
+def default_report_compliant(compliant_balances, recent_transactions):
+    """Full DEFAULT_RULES report for the diversified portfolio."""
+    return validate_policy(compliant_balances, DEFAULT_RULES, transactions=recent_transactions)
+
+
+@pytest.fixture(scope="session")
+def default_report_concentrated(concentrated_balances, recent_transactions):
+    """Full DEFAULT_RULES report for the single-token portfolio."""
+    return validate_policy(concentrated_balances, DEFAULT_RULES, transactions=recent_transactions)
+
+
+@pytest.fixture(scope="session")
+def default_report_empty(empty_balances):
+    """Full DEFAULT_RULES report for the empty portfolio with no transactions."""
+    return validate_policy(empty_balances, DEFAULT_RULES, transactions=[])
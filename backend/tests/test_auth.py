@@ -11,12 +11,26 @@ from httpx import AsyncClient, ASGITransport
 from app.main import app, _rate_buckets
 
 
+# Test-only hashes use the minimum work factor; production hashing keeps
+# bcrypt's default rounds.
+_HASH_PASSWORD123 = bcrypt.hashpw(b"password123", bcrypt.gensalt(rounds=4)).decode()
+_HASH_CORRECTPASSWORD = bcrypt.hashpw(b"correctpassword", bcrypt.gensalt(rounds=4)).decode()
+
+# ASGITransport holds no per-request state, so one instance serves every test.
+_transport = ASGITransport(app=app)
+
+
+@pytest.fixture(autouse=True)
+def reset_rate_limiter():
+    """Reset rate limiter between tests."""
+    _rate_buckets.clear()
+    yield
+
+
 @pytest_asyncio.fixture
 async def client():
     """Async test client for the FastAPI app."""
-    _rate_buckets.clear()  # Reset rate limiter between tests
-    transport = ASGITransport(app=app)
-    async with AsyncClient(transport=transport, base_url="http://test") as c:
+    async with AsyncClient(transport=_transport, base_url="http://test") as c:
         yield c
 
 
@@ -58,8 +72,7 @@ async def test_signup_invalid_email(client):
 
 @pytest.mark.asyncio
 async def test_verify_success(client):
-    hashed = bcrypt.hashpw(b"password123", bcrypt.gensalt()).decode()
-    mock_user = {"id": 1, "email": "test@example.com", "name": "Test", "password_hash": hashed, "plan": "free"}
+    mock_user = {"id": 1, "email": "test@example.com", "name": "Test", "password_hash": _HASH_PASSWORD123, "plan": "free"}
     with patch("app.main.get_user_by_email", new_callable=AsyncMock, return_value=mock_user):
         resp = await client.post("/auth/verify", json={"email": "test@example.com", "password": "password123"})
     assert resp.status_code == 200
@@ -68,8 +81,7 @@ async def test_verify_success(client):
 
 @pytest.mark.asyncio
 async def test_verify_wrong_password(client):
-    hashed = bcrypt.hashpw(b"correctpassword", bcrypt.gensalt()).decode()
-    mock_user = {"id": 1, "email": "test@example.com", "name": "Test", "password_hash": hashed, "plan": "free"}
+    mock_user = {"id": 1, "email": "test@example.com", "name": "Test", "password_hash": _HASH_CORRECTPASSWORD, "plan": "free"}
     with patch("app.main.get_user_by_email", new_callable=AsyncMock, return_value=mock_user):
         resp = await client.post("/auth/verify", json={"email": "test@example.com", "password": "wrongpassword"})
     assert resp.status_code == 401
@@ -1,14 +1,55 @@
 """Tests for the AEGIS policy validator — all 10 treasury rules."""
 
-from app.validator import validate_policy, DEFAULT_RULES
+import copy
+from datetime import datetime, timedelta, timezone
 
+import pytest
 
-# --- allocation_cap ---
+from app.validator import validate_policy, DEFAULT_RULES
 
-def test_allocation_cap_pass(compliant_balances):
-    """Balanced portfolio: each token is 25% — passes 30% cap."""
-    report = validate_policy(compliant_balances, [{"type": "allocation_cap", "params": {"max_percent": 30}, "severity": "breach"}])
-    assert report["overall_status"] == "COMPLIANT"
+
+# --- Per-rule pass/fail ---
+
+RULE_CASES = [
+    # allocation_cap: each token is 25% — passes 30% cap; empty portfolio passes
+    pytest.param("compliant_balances", None, {"type": "allocation_cap", "params": {"max_percent": 30}, "severity": "breach"}, "COMPLIANT", id="allocation_cap-pass"),
+    pytest.param("empty_balances", None, {"type": "allocation_cap", "params": {"max_percent": 30}, "severity": "breach"}, "COMPLIANT", id="allocation_cap-empty"),
+    # stablecoin_floor: 50% stablecoins passes 20% floor; 0% fails
+    pytest.param("compliant_balances", None, {"type": "stablecoin_floor", "params": {"min_percent": 20}, "severity": "breach"}, "COMPLIANT", id="stablecoin_floor-pass"),
+    pytest.param("concentrated_balances", None, {"type": "stablecoin_floor", "params": {"min_percent": 20}, "severity": "breach"}, "NON-COMPLIANT", id="stablecoin_floor-fail"),
+    # single_asset_cap: $250K tokens pass $500K cap; a $500K token fails $400K
+    pytest.param("compliant_balances", None, {"type": "single_asset_cap", "params": {"max_usd": 500000}, "severity": "warning"}, "COMPLIANT", id="single_asset_cap-pass"),
+    pytest.param("concentrated_balances", None, {"type": "single_asset_cap", "params": {"max_usd": 400000}, "severity": "warning"}, "NON-COMPLIANT", id="single_asset_cap-fail"),
+    # max_tx_size: 1 ETH tx ($2,500) passes $100K cap; 40 ETH tx ($100K) fails $50K
+    pytest.param("compliant_balances", "recent_transactions", {"type": "max_tx_size", "params": {"max_usd": 100000}, "severity": "warning"}, "COMPLIANT", id="max_tx_size-pass"),
+    pytest.param("compliant_balances", "large_transactions", {"type": "max_tx_size", "params": {"max_usd": 50000}, "severity": "warning"}, "NON-COMPLIANT", id="max_tx_size-fail"),
+    # inactivity_alert: recent tx within 168h passes; tx 240h ago fails
+    pytest.param("compliant_balances", "recent_transactions", {"type": "inactivity_alert", "params": {"threshold_hours": 168}, "severity": "warning"}, "COMPLIANT", id="inactivity-pass"),
+    pytest.param("compliant_balances", "stale_transactions", {"type": "inactivity_alert", "params": {"threshold_hours": 168}, "severity": "warning"}, "NON-COMPLIANT", id="inactivity-fail"),
+    # min_diversification: 4 tokens pass minimum of 3; 1 token fails
+    pytest.param("compliant_balances", None, {"type": "min_diversification", "params": {"min_tokens": 3}, "severity": "warning"}, "COMPLIANT", id="diversification-pass"),
+    pytest.param("concentrated_balances", None, {"type": "min_diversification", "params": {"min_tokens": 3}, "severity": "warning"}, "NON-COMPLIANT", id="diversification-fail"),
+    # volatile_exposure: 50% volatile passes 80% cap; 100% fails
+    pytest.param("compliant_balances", None, {"type": "volatile_exposure", "params": {"max_percent": 80}, "severity": "breach"}, "COMPLIANT", id="volatile_exposure-pass"),
+    pytest.param("concentrated_balances", None, {"type": "volatile_exposure", "params": {"max_percent": 80}, "severity": "breach"}, "NON-COMPLIANT", id="volatile_exposure-fail"),
+    # min_treasury_value: $1M passes $100K minimum; $50K fails
+    pytest.param("compliant_balances", None, {"type": "min_treasury_value", "params": {"min_usd": 100000}, "severity": "warning"}, "COMPLIANT", id="min_treasury-pass"),
+    pytest.param("small_balances", None, {"type": "min_treasury_value", "params": {"min_usd": 100000}, "severity": "warning"}, "NON-COMPLIANT", id="min_treasury-fail"),
+    # large_tx_ratio: $2,500 vs $1M = 0.25% passes 15% cap; $100K vs $1M = 10% fails 5%
+    pytest.param("compliant_balances", "recent_transactions", {"type": "large_tx_ratio", "params": {"max_percent": 15}, "severity": "warning"}, "COMPLIANT", id="large_tx_ratio-pass"),
+    pytest.param("compliant_balances", "large_transactions", {"type": "large_tx_ratio", "params": {"max_percent": 5}, "severity": "warning"}, "NON-COMPLIANT", id="large_tx_ratio-fail"),
+    # concentration_hhi: 4 tokens at 25% each gives HHI 2500 — passes 3000
+    pytest.param("compliant_balances", None, {"type": "concentration_hhi", "params": {"max_hhi": 3000}, "severity": "warning"}, "COMPLIANT", id="hhi-pass"),
+]
+
+
+@pytest.mark.parametrize("balances_fx,transactions_fx,rule,expected", RULE_CASES)
+def test_rule_status(request, balances_fx, transactions_fx, rule, expected):
+    """Each rule passes or fails on the fixture portfolios as documented above."""
+    balances = request.getfixturevalue(balances_fx)
+    transactions = request.getfixturevalue(transactions_fx) if transactions_fx else None
+    report = validate_policy(balances, [rule], transactions=transactions)
+    assert report["overall_status"] == expected
 
 
 def test_allocation_cap_fail(concentrated_balances):
@@ -18,92 +59,53 @@ def test_allocation_cap_fail(concentrated_balances):
     assert any(not r["passed"] for r in report["results"])
 
 
-def test_allocation_cap_empty(empty_balances):
-    """Empty portfolio passes allocation cap."""
-    report = validate_policy(empty_balances, [{"type": "allocation_cap", "params": {"max_percent": 30}, "severity": "breach"}])
-    assert report["overall_status"] == "COMPLIANT"
-
-
-# --- stablecoin_floor ---
-
-def test_stablecoin_floor_pass(compliant_balances):
-    """50% stablecoins — passes 20% floor."""
-    report = validate_policy(compliant_balances, [{"type": "stablecoin_floor", "params": {"min_percent": 20}, "severity": "breach"}])
-    assert report["overall_status"] == "COMPLIANT"
-
-
-def test_stablecoin_floor_fail(concentrated_balances):
-    """0% stablecoins — fails 20% floor."""
-    report = validate_policy(concentrated_balances, [{"type": "stablecoin_floor", "params": {"min_percent": 20}, "severity": "breach"}])
-    assert report["overall_status"] == "NON-COMPLIANT"
-
-
-# --- single_asset_cap ---
-
-def test_single_asset_cap_pass(compliant_balances):
-    """All tokens at $250K — passes $500K cap."""
-    report = validate_policy(compliant_balances, [{"type": "single_asset_cap", "params": {"max_usd": 500000}, "severity": "warning"}])
-    assert report["overall_status"] == "COMPLIANT"
-
-
-def test_single_asset_cap_fail(concentrated_balances):
-    """Single token at $500K — fails $400K cap."""
-    report = validate_policy(concentrated_balances, [{"type": "single_asset_cap", "params": {"max_usd": 400000}, "severity": "warning"}])
-    assert report["overall_status"] == "NON-COMPLIANT"
-
-
-# --- max_tx_size ---
-
-def test_max_tx_size_pass(compliant_balances, recent_transactions):
-    """1 ETH tx ($2,500) — passes $100K cap."""
+def test_max_tx_size_no_transactions(compliant_balances):
+    """No transaction data — passes (skipped)."""
     report = validate_policy(
         compliant_balances,
         [{"type": "max_tx_size", "params": {"max_usd": 100000}, "severity": "warning"}],
-        transactions=recent_transactions,
+        transactions=None,
     )
     assert report["overall_status"] == "COMPLIANT"
 
 
-def test_max_tx_size_fail(compliant_balances, large_transactions):
-    """40 ETH tx ($100K) — fails $50K cap."""
-    report = validate_policy(
-        compliant_balances,
-        [{"type": "max_tx_size", "params": {"max_usd": 50000}, "severity": "warning"}],
-        transactions=large_transactions,
-    )
-    assert report["overall_status"] == "NON-COMPLIANT"
-
-
-def test_max_tx_size_no_transactions(compliant_balances):
-    """No transaction data — passes (skipped)."""
+def test_inactivity_uses_most_recent_transaction(compliant_balances, stale_transactions, recent_transactions):
+    """Latest tx decides activity regardless of list order."""
     report = validate_policy(
         compliant_balances,
-        [{"type": "max_tx_size", "params": {"max_usd": 100000}, "severity": "warning"}],
-        transactions=None,
+        [{"type": "inactivity_alert", "params": {"threshold_hours": 168}, "severity": "warning"}],
+        transactions=stale_transactions + recent_transactions,
     )
     assert report["overall_status"] == "COMPLIANT"
 
 
-# --- inactivity_alert ---
-
-def test_inactivity_pass(compliant_balances, recent_transactions):
-    """Recent transaction within 168h — passes."""
+def test_inactivity_handles_non_utc_offsets(compliant_balances, recent_transactions):
+    """A non-UTC offset can sort lexically after the true latest date."""
+    now = datetime.now(timezone.utc)
+    newer = {**recent_transactions[0], "execution_date": (now - timedelta(hours=160)).isoformat()}
+    older = {
+        **recent_transactions[0],
+        "execution_date": (now - timedelta(hours=170)).astimezone(timezone(timedelta(hours=14))).isoformat(),
+    }
     report = validate_policy(
         compliant_balances,
         [{"type": "inactivity_alert", "params": {"threshold_hours": 168}, "severity": "warning"}],
-        transactions=recent_transactions,
+        transactions=[newer, older],
     )
     assert report["overall_status"] == "COMPLIANT"
 
 
-def test_inactivity_fail(compliant_balances, stale_transactions):
-    """Transaction 240h ago — fails 168h threshold."""
+def test_inactivity_uses_supplied_now(compliant_balances, recent_transactions):
+    """A fixed `now` makes the hours-since-activity value deterministic."""
+    tx = {**recent_transactions[0], "execution_date": "2024-01-01T00:00:00Z"}
     report = validate_policy(
         compliant_balances,
         [{"type": "inactivity_alert", "params": {"threshold_hours": 168}, "severity": "warning"}],
-        transactions=stale_transactions,
+        transactions=[tx],
+        now=datetime(2024, 1, 8, 12, tzinfo=timezone.utc),
     )
     assert report["overall_status"] == "NON-COMPLIANT"
+    assert report["results"][0]["current_value"] == "180h ago"
 
 
 def test_inactivity_no_transactions(compliant_balances):
@@ -116,78 +118,6 @@ def test_inactivity_no_transactions(compliant_balances):
     assert report["overall_status"] == "NON-COMPLIANT"
 
 
-# --- min_diversification ---
-
-def test_diversification_pass(compliant_balances):
-    """4 tokens — passes minimum of 3."""
-    report = validate_policy(compliant_balances, [{"type": "min_diversification", "params": {"min_tokens": 3}, "severity": "warning"}])
-    assert report["overall_status"] == "COMPLIANT"
-
-
-def test_diversification_fail(concentrated_balances):
-    """1 token — fails minimum of 3."""
-    report = validate_policy(concentrated_balances, [{"type": "min_diversification", "params": {"min_tokens": 3}, "severity": "warning"}])
-    assert report["overall_status"] == "NON-COMPLIANT"
-
-
-# --- volatile_exposure ---
-
-def test_volatile_exposure_pass(compliant_balances):
-    """50% volatile — passes 80% cap."""
-    report = validate_policy(compliant_balances, [{"type": "volatile_exposure", "params": {"max_percent": 80}, "severity": "breach"}])
-    assert report["overall_status"] == "COMPLIANT"
-
-
-def test_volatile_exposure_fail(concentrated_balances):
-    """100% volatile — fails 80% cap."""
-    report = validate_policy(concentrated_balances, [{"type": "volatile_exposure", "params": {"max_percent": 80}, "severity": "breach"}])
-    assert report["overall_status"] == "NON-COMPLIANT"
-
-
-# --- min_treasury_value ---
-
-def test_min_treasury_pass(compliant_balances):
-    """$1M portfolio — passes $100K minimum."""
-    report = validate_policy(compliant_balances, [{"type": "min_treasury_value", "params": {"min_usd": 100000}, "severity": "warning"}])
-    assert report["overall_status"] == "COMPLIANT"
-
-
-def test_min_treasury_fail(small_balances):
-    """$50K portfolio — fails $100K minimum."""
-    report = validate_policy(small_balances, [{"type": "min_treasury_value", "params": {"min_usd": 100000}, "severity": "warning"}])
-    assert report["overall_status"] == "NON-COMPLIANT"
-
-
-# --- large_tx_ratio ---
-
-def test_large_tx_ratio_pass(compliant_balances, recent_transactions):
-    """1 ETH ($2,500) vs $1M portfolio = 0.25% — passes 15% cap."""
-    report = validate_policy(
-        compliant_balances,
-        [{"type": "large_tx_ratio", "params": {"max_percent": 15}, "severity": "warning"}],
-        transactions=recent_transactions,
-    )
-    assert report["overall_status"] == "COMPLIANT"
-
-
-def test_large_tx_ratio_fail(compliant_balances, large_transactions):
-    """40 ETH ($100K) vs $1M portfolio = 10% — fails 5% cap."""
-    report = validate_policy(
-        compliant_balances,
-        [{"type": "large_tx_ratio", "params": {"max_percent": 5}, "severity": "warning"}],
-        transactions=large_transactions,
-    )
-    assert report["overall_status"] == "NON-COMPLIANT"
-
-
-# --- concentration_hhi ---
-
-def test_hhi_pass(compliant_balances):
-    """4 tokens at 25% each: HHI = 4 * 625 = 2500 — passes 3000."""
-    report = validate_policy(compliant_balances, [{"type": "concentration_hhi", "params": {"max_hhi": 3000}, "severity": "warning"}])
-    assert report["overall_status"] == "COMPLIANT"
-
-
 def test_hhi_fail(concentrated_balances):
     """1 token at 100%: HHI = 10000 — fails 3000."""
     report = validate_policy(concentrated_balances, [{"type": "concentration_hhi", "params": {"max_hhi": 3000}, "severity": "warning"}])
@@ -196,11 +126,20 @@ def test_hhi_fail(concentrated_balances):
     assert "concentrated" in result["current_value"]
 
 
+def test_hhi_score_values(compliant_balances, concentrated_balances):
+    """HHI matches the textbook values for equal-weight and single-token portfolios."""
+    rules = [{"type": "concentration_hhi", "params": {"max_hhi": 3000}, "severity": "warning"}]
+    balanced = validate_policy(compliant_balances, rules)["results"][0]
+    single = validate_policy(concentrated_balances, rules)["results"][0]
+    assert balanced["current_value"].startswith("2500 ")
+    assert single["current_value"].startswith("10000 ")
+
+
 # --- Full report structure ---
 
-def test_full_report_structure(compliant_balances, recent_transactions):
+def test_full_report_structure(default_report_compliant):
     """Validate the report dict shape with all default rules."""
-    report = validate_policy(compliant_balances, DEFAULT_RULES, transactions=recent_transactions)
+    report = default_report_compliant
 
     assert "safe_address" in report
     assert "total_usd" in report
@@ -225,16 +164,25 @@ def test_full_report_structure(compliant_balances, recent_transactions):
         assert "severity" in r
 
 
-def test_empty_portfolio_handles_gracefully(empty_balances):
+def test_empty_portfolio_handles_gracefully(default_report_empty):
     """Empty portfolio should not crash on any rule."""
-    report = validate_policy(empty_balances, DEFAULT_RULES, transactions=[])
+    report = default_report_empty
     assert report["total_rules"] > 0
     assert isinstance(report["results"], list)
 
 
-def test_recommendations_only_for_failures(concentrated_balances, recent_transactions):
+def test_recommendations_only_for_failures(default_report_concentrated):
     """Recommendations should only be generated for failed rules."""
-    report = validate_policy(concentrated_balances, DEFAULT_RULES, transactions=recent_transactions)
+    report = default_report_concentrated
     failed_rules = {r["rule"] for r in report["results"] if not r["passed"]}
     rec_rules = {r["rule"] for r in report["recommendations"]}
     assert rec_rules.issubset(failed_rules)
+
+
+def test_validate_policy_does_not_mutate_inputs(compliant_balances, large_transactions):
+    """Session-scoped fixtures are shared, so validation must leave its inputs untouched."""
+    balances_before = copy.deepcopy(compliant_balances)
+    transactions_before = copy.deepcopy(large_transactions)
+    validate_policy(compliant_balances, DEFAULT_RULES, transactions=large_transactions)
+    assert compliant_balances == balances_before
+    assert large_transactions == transactions_before
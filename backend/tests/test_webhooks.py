@@ -0,0 +1,35 @@
+"""Tests for AEGIS webhook payloads and signing."""
+
+import hashlib
+import hmac
+import json
+from datetime import datetime, timezone
+
+from app.validator import validate_policy, DEFAULT_RULES
+from app.webhooks import build_webhook_payload, _sign_payload
+
+
+WALLET = {"id": 7, "address": "0x" + "a" * 40, "chain": "ethereum", "label": "Ops"}
+
+
+def test_payload_is_json_native(concentrated_balances, recent_transactions):
+    """Payload serializes with the plain encoder — no default= fallback."""
+    report = validate_policy(concentrated_balances, DEFAULT_RULES, transactions=recent_transactions)
+    payload = build_webhook_payload(WALLET, report, audit_id=1, trigger="scheduled")
+    decoded = json.loads(json.dumps(payload))
+    assert decoded["audit"]["overall_status"] == "NON-COMPLIANT"
+    assert decoded["failures"]
+    assert isinstance(decoded["timestamp"], str)
+
+
+def test_sign_payload_matches_hmac_sha256():
+    body = json.dumps({"event": "audit.alert"}).encode()
+    expected = hmac.new(b"secret", body, hashlib.sha256).hexdigest()
+    assert _sign_payload("secret", body) == expected
+
+
+def test_payload_uses_supplied_timestamp():
+    now = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    payload = build_webhook_payload(WALLET, {"results": []}, audit_id=None, trigger="manual", now=now)
+    assert payload["timestamp"] == "2024-01-01T00:00:00+00:00"
+    assert payload["summary"] == "Audit completed."
@@ -3,37 +3,67 @@
 
 Usage:
     python validate.py --safe 0x... --policy policy.yaml
+
+Policies may also be written as .json or .toml (Python 3.11+).
 """
 
 import argparse
 import asyncio
 import json
+import os
 import sys
 
-import yaml
+import httpx
 
 from backend.app.safe_reader import fetch_safe_balances, fetch_safe_transactions
 from backend.app.validator import validate_policy
 
 
+def load_policy(path):
+    """Parse a policy file, choosing the parser by extension.
+
+    .json and .toml use the standard library; anything else is read as YAML,
+    so PyYAML is only imported when a YAML policy is actually loaded.
+    """
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".json":
+        with open(path) as f:
+            return json.load(f)
+    if ext == ".toml":
+        import tomllib  # Python 3.11+
+
+        with open(path, "rb") as f:
+            return tomllib.load(f)
+
+    import yaml
+
+    # libyaml's C loader when PyYAML was built with it; same safe semantics
+    loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+    with open(path) as f:
+        return yaml.load(f, Loader=loader)
+
+
 async def main():
     parser = argparse.ArgumentParser(description="AEGIS Policy Validator")
     parser.add_argument("--safe", required=True, help="Gnosis Safe address (0x...)")
-    parser.add_argument("--policy", required=True, help="Path to policy YAML file")
+    parser.add_argument("--policy", required=True, help="Path to policy file (.yaml, .json or .toml)")
     parser.add_argument("--pretty", action="store_true", help="Pretty-print JSON output")
     args = parser.parse_args()
 
     # Load policy
-    with open(args.policy) as f:
-        policy = yaml.safe_load(f)
+    policy = load_policy(args.policy)
 
     if "rules" not in policy:
         print("Error: Policy file must contain 'rules' key", file=sys.stderr)
         sys.exit(1)
 
-    # Fetch balances
-    print(f"Fetching balances for {args.safe}...", file=sys.stderr)
-    balances = await fetch_safe_balances(args.safe)
+    # Fetch balances and transaction history concurrently
+    print(f"Fetching balances and transaction history for {args.safe}...", file=sys.stderr)
+    async with httpx.AsyncClient(timeout=30, follow_redirects=True) as client:
+        balances, transactions = await asyncio.gather(
+            fetch_safe_balances(args.safe, client=client),
+            fetch_safe_transactions(args.safe, limit=20, client=client),
+        )
 
     if balances is None:
         print(f"Error: Could not fetch balances for {args.safe}", file=sys.stderr)
@@ -41,10 +71,6 @@ async def main():
 
     print(f"Portfolio: ${balances['total_usd']:,.2f} across {len(balances['tokens'])} tokens", file=sys.stderr)
 
-    # Fetch transaction history
-    print(f"Fetching transaction history...", file=sys.stderr)
-    transactions = await fetch_safe_transactions(args.safe, limit=20)
-
     if transactions is None:
         print("Warning: Could not fetch transaction history. Some rules will be skipped.", file=sys.stderr)
     else:
@@ -54,8 +80,10 @@ async def main():
     report = validate_policy(balances, policy["rules"], transactions=transactions)
 
     # Output
-    indent = 2 if args.pretty else None
-    print(json.dumps(report, indent=indent))
+    if args.pretty:
+        print(json.dumps(report, indent=2))
+    else:
+        print(json.dumps(report, separators=(",", ":")))
 
     # Exit code: 0 = compliant, 1 = violations found
     sys.exit(0 if report["overall_status"] == "COMPLIANT" else 1)